@@ -13,8 +13,18 @@ CYAN = "\033[36m"
 RESET = "\033[0m"
 
 
+# The last stdout checked and whether it is a TTY. isatty() is a syscall and
+# color() runs several times per output line, so the answer is reused until
+# sys.stdout is swapped out.
+_tty_cache: tuple[object, bool] | None = None
+
+
 def _is_tty() -> bool:
-    return hasattr(sys.stdout, "isatty") and sys.stdout.isatty()
+    global _tty_cache
+    stream = sys.stdout
+    if _tty_cache is None or _tty_cache[0] is not stream:
+        _tty_cache = (stream, hasattr(stream, "isatty") and stream.isatty())
+    return _tty_cache[1]
 
 
 def color(text: str, code: str) -> str:
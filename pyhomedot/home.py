@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import sys
+from collections.abc import Callable
 
 from pyhomedot.color import BOLD, CYAN, DIM, GREEN, RED, YELLOW, color
 from pyhomedot.resources.base import Resource
+from pyhomedot.resources.package import PackageResource
 from pyhomedot.resources.symlink import SymlinkResource
 
 _SENTINEL: object = object()
 
+# A compiled step of a real (non-dry) run; takes the resolved show_diff flag
+_Step = Callable[[bool], None]
+
 _DRY_RUN_LEGEND = f"""  {color('Legend:', BOLD)}
     {color('OK', GREEN)}       — symlink already correct (no-op)
     {color('CREATE', GREEN)}   — target missing, will create symlink
@@ -26,6 +31,7 @@ class Home:
 
     def __init__(self) -> None:
         self.resources: list[Resource] = []
+        self._compiled: tuple[tuple[Resource, ...], list[_Step]] | None = None
 
     def add(self, *resources: Resource) -> Home:
         """Add one or more resources. Returns self for chaining."""
@@ -52,6 +58,11 @@ class Home:
         resolved_force = bool(force) if force is not _SENTINEL else "--force" in sys.argv
         resolved_diff = bool(show_diff) if show_diff is not _SENTINEL else "--diff" in sys.argv
 
+        if not self.resources:
+            # Nothing to generate: skip the legend and run planning
+            _print_summary(0, dry_run=resolved_dry_run)
+            return
+
         # Apply CLI --force to SymlinkResources that didn't explicitly set force
         if resolved_force:
             for resource in self.resources:
@@ -60,12 +71,83 @@ class Home:
 
         if resolved_dry_run:
             print(_DRY_RUN_LEGEND)
+            # Keep dry-run output in declaration order
+            for resource in self.resources:
+                resource.generate(dry_run=True, show_diff=resolved_diff)
+        else:
+            for step in self._compile():
+                step(resolved_diff)
 
-        for resource in self.resources:
-            resource.generate(dry_run=resolved_dry_run, show_diff=resolved_diff)
+        _print_summary(len(self.resources), dry_run=resolved_dry_run)
 
-        total = len(self.resources)
-        if resolved_dry_run:
-            print(f"\n  {color(f'{total} resources checked (dry run — no changes made)', DIM)}")
+    def _compile(self) -> list[_Step]:
+        """Plan how to generate the current resources and return the steps to run.
+
+        Runs are grouped and each one is bound to its batch or single-resource
+        code path up front, so repeated generate() calls over an unchanged
+        resource list skip the planning entirely.
+        """
+        snapshot = tuple(self.resources)
+        if self._compiled is None or self._compiled[0] != snapshot:
+            self._compiled = (snapshot, [_compile_run(run) for run in _runs(self.resources)])
+        return self._compiled[1]
+
+
+def _print_summary(total: int, *, dry_run: bool) -> None:
+    if dry_run:
+        print(f"\n  {color(f'{total} resources checked (dry run — no changes made)', DIM)}")
+    else:
+        print(f"\n  {color(f'{total} resources processed', DIM)}")
+
+
+def _run_kind(resource: Resource) -> str | None:
+    """Return the kind of run a resource can join, or None if it must run alone."""
+    if isinstance(resource, PackageResource):
+        return "package"
+    if isinstance(resource, SymlinkResource):
+        return "symlink"
+    return None
+
+
+def _runs(resources: list[Resource]) -> list[list[Resource]]:
+    """Split resources into consecutive runs that can be generated together.
+
+    Neighbouring packages are batched into shared package-manager calls and
+    neighbouring symlinks share their target directory listings. Every other
+    resource gets a run of its own so declaration order is preserved.
+    """
+    runs: list[list[Resource]] = []
+    for resource in resources:
+        kind = _run_kind(resource)
+        if kind is not None and runs and _run_kind(runs[-1][-1]) == kind:
+            runs[-1].append(resource)
         else:
-            print(f"\n  {color(f'{total} resources processed', DIM)}")
+            runs.append([resource])
+    return runs
+
+
+def _compile_run(run: list[Resource]) -> _Step:
+    """Bind a run to the code path that generates it: package batch, symlink batch or single resource."""
+    packages = [r for r in run if isinstance(r, PackageResource)]
+    if packages:
+
+        def generate_packages(show_diff: bool) -> None:
+            PackageResource.generate_batch(packages, show_diff=show_diff)
+
+        return generate_packages
+
+    if len(run) == 1:
+        resource = run[0]
+
+        def generate_one(show_diff: bool) -> None:
+            resource.generate(dry_run=False, show_diff=show_diff)
+
+        return generate_one
+
+    # generate_batch spreads larger runs over threads by target directory itself
+    symlinks = [r for r in run if isinstance(r, SymlinkResource)]
+
+    def generate_symlinks(show_diff: bool) -> None:
+        SymlinkResource.generate_batch(symlinks, show_diff=show_diff)
+
+    return generate_symlinks
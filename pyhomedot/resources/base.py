@@ -18,6 +18,9 @@ def noninteractive_env(extra: dict[str, str] | None = None) -> dict[str, str]:
 class Resource(ABC):
     """Abstract base class for all pyhomedot resources."""
 
+    # Subclasses declare their attributes in __slots__ so instances carry no __dict__
+    __slots__ = ()
+
     @abstractmethod
     def generate(self, *, dry_run: bool = False, show_diff: bool = False) -> None:
         """Generate/apply this resource.
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import json
+import os
 import subprocess
+from pathlib import Path
 from typing import Literal
 
 from pyhomedot.resources.base import Resource, noninteractive_env
@@ -10,10 +13,173 @@ from pyhomedot.resources.base import Resource, noninteractive_env
 Provider = Literal["apt", "brew", "mise"]
 VALID_PROVIDERS: set[Provider] = {"apt", "brew", "mise"}
 
+# Package-manager commands keyed by (provider, installed), without the package argument
+_COMMAND_PREFIXES: dict[tuple[Provider, bool], tuple[str, ...]] = {
+    ("apt", True): ("apt-get", "install", "-y"),
+    ("apt", False): ("apt-get", "remove", "-y"),
+    ("brew", True): ("brew", "install"),
+    ("brew", False): ("brew", "uninstall"),
+    ("mise", True): ("mise", "use", "-g"),
+    ("mise", False): ("mise", "uninstall"),
+}
+
+# Provider-specific variables that suppress prompts
+_NONINTERACTIVE_VARS: dict[Provider, dict[str, str]] = {
+    "apt": {"DEBIAN_FRONTEND": "noninteractive"},
+    "brew": {"HOMEBREW_NO_AUTO_UPDATE": "1"},
+    "mise": {"MISE_YES": "1"},
+}
+
+# Commands listing installed package names, keyed by (provider, cask).
+# mise is absent: `mise use -g` also pins the global config, so it always runs.
+_INSTALLED_QUERIES: dict[tuple[Provider, bool], list[str]] = {
+    ("apt", False): ["dpkg-query", "-W", "-f=${db:Status-Abbrev} ${Package}\n"],
+    ("brew", False): ["brew", "list", "--formula", "-1"],
+    ("brew", True): ["brew", "list", "--cask", "-1"],
+}
+
+
+# Default Homebrew prefixes (Apple Silicon, Intel macOS, Linux), used when
+# HOMEBREW_PREFIX isn't set
+_BREW_PREFIXES = ("/opt/homebrew", "/usr/local", "/home/linuxbrew/.linuxbrew")
+
+
+def _package_db(provider: Provider, cask: bool) -> Path | None:
+    """Return a path whose mtime changes whenever the provider's installed packages change."""
+    if provider == "apt":
+        return Path("/var/lib/dpkg/status")
+    if provider == "brew":
+        subdir = "Caskroom" if cask else "Cellar"
+        env_prefix = os.environ.get("HOMEBREW_PREFIX")
+        prefixes = (env_prefix,) if env_prefix else _BREW_PREFIXES
+        for prefix in prefixes:
+            path = Path(prefix) / subdir
+            if path.is_dir():
+                return path
+    return None
+
+
+def _cache_path(provider: Provider, cask: bool) -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    cache_dir = Path(cache_home) if cache_home else Path.home() / ".cache"
+    suffix = "-cask" if cask else ""
+    return cache_dir / "pyhomedot" / f"installed-{provider}{suffix}.json"
+
+
+def _read_cache(path: Path, mtime_ns: int) -> frozenset[str] | None:
+    """Return the cached package names if they were recorded against the given mtime."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("mtime_ns") != mtime_ns:
+        return None
+    packages = data.get("packages")
+    if not isinstance(packages, list):
+        return None
+    return frozenset(str(p) for p in packages)
+
+
+def _write_cache(path: Path, mtime_ns: int, packages: frozenset[str]) -> None:
+    """Best-effort atomic write; a missing cache only costs a query next time."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"mtime_ns": mtime_ns, "packages": sorted(packages)}))
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _query_installed(provider: Provider, cask: bool) -> frozenset[str] | None:
+    """Ask the package manager which packages are installed, or None if it can't say."""
+    cmd = _INSTALLED_QUERIES.get((provider, cask))
+    if cmd is None:
+        return None
+    try:
+        # stderr is never inspected, so don't pay for a pipe to buffer it
+        result = subprocess.run(cmd, check=False, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    if provider == "apt":
+        # Lines look like "ii  htop"; only fully installed packages count
+        names: set[str] = set()
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[0] == "ii":
+                names.add(parts[1])
+        return frozenset(names)
+    return frozenset(line.strip() for line in result.stdout.splitlines() if line.strip())
+
+
+# Installed package names per (provider, cask) for this process. A batch drops
+# the entry of a provider as soon as it installs or removes something with it;
+# the other providers' listings stay valid.
+_installed_cache: dict[tuple[Provider, bool], frozenset[str] | None] = {}
+
+
+def _installed_packages(provider: Provider, cask: bool) -> frozenset[str] | None:
+    """Return the names of installed packages, or None if they can't be determined.
+
+    Results are also cached on disk under $XDG_CACHE_HOME/pyhomedot, keyed by the
+    mtime of the provider's package database, so repeated runs skip the query
+    until something is installed or removed. Cached in memory in _installed_cache;
+    callers must pop their key after installing or removing packages.
+    """
+    key = (provider, cask)
+    if key not in _installed_cache:
+        _installed_cache[key] = _load_installed(provider, cask)
+    return _installed_cache[key]
+
+
+def _load_installed(provider: Provider, cask: bool) -> frozenset[str] | None:
+    """Read the installed package names from the on-disk cache or the package manager."""
+    if (provider, cask) not in _INSTALLED_QUERIES:
+        return None
+
+    db = _package_db(provider, cask)
+    try:
+        # Read the mtime before querying so a concurrent change invalidates the entry
+        mtime_ns = db.stat().st_mtime_ns if db is not None else None
+    except OSError:
+        mtime_ns = None
+
+    cache = _cache_path(provider, cask)
+    if mtime_ns is not None:
+        cached = _read_cache(cache, mtime_ns)
+        if cached is not None:
+            return cached
+
+    installed = _query_installed(provider, cask)
+    if installed is not None and mtime_ns is not None:
+        _write_cache(cache, mtime_ns, installed)
+    return installed
+
+
+def _prefetch_installed(keys: list[tuple[Provider, bool]]) -> None:
+    """Warm the installed-package cache for several providers at once.
+
+    Listing queries are read-only and take no package-manager locks, so they
+    can overlap; `brew list` alone can take seconds on a cold start.
+    """
+    if len(keys) < 2:
+        return
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        futures = [executor.submit(_installed_packages, provider, cask) for provider, cask in keys]
+    for future in futures:
+        future.result()
+
 
 class PackageResource(Resource):
     """Installs or uninstalls packages using supported providers (apt, brew, mise)."""
 
+    __slots__ = ("name", "provider", "installed", "version", "cask", "interactive")
+
     def __init__(
         self,
         name: str,
@@ -48,42 +214,117 @@ class PackageResource(Resource):
         """Return the subprocess environment, or None to inherit the default."""
         if self.interactive:
             return None
-        extra: dict[str, str] = {}
-        if self.provider == "apt":
-            extra["DEBIAN_FRONTEND"] = "noninteractive"
-        elif self.provider == "brew":
-            extra["HOMEBREW_NO_AUTO_UPDATE"] = "1"
-        elif self.provider == "mise":
-            extra["MISE_YES"] = "1"
-        return noninteractive_env(extra)
+        return noninteractive_env(_NONINTERACTIVE_VARS[self.provider])
+
+    def _command_prefix(self) -> list[str]:
+        """Return the package-manager command without the package argument."""
+        cmd = list(_COMMAND_PREFIXES[(self.provider, self.installed)])
+        if self.cask:
+            cmd.append("--cask")
+        return cmd
+
+    def _command_arg(self) -> str:
+        """Return the package argument: the versioned spec to install, the bare name to remove."""
+        return self._package_spec() if self.installed else self.name
 
     def _build_command(self) -> list[str]:
-        spec = self._package_spec()
-        if self.provider == "apt":
-            if self.installed:
-                return ["apt-get", "install", "-y", spec]
-            else:
-                return ["apt-get", "remove", "-y", self.name]
-        elif self.provider == "brew":
-            if self.installed:
-                cmd = ["brew", "install"]
-                if self.cask:
-                    cmd.append("--cask")
-                cmd.append(spec)
-                return cmd
+        return [*self._command_prefix(), self._command_arg()]
+
+    def _batchable(self) -> bool:
+        """Whether this package can join a shared call; an overridden generate() must run as written."""
+        return type(self).generate is PackageResource.generate
+
+    def _batch_key(self) -> tuple[Provider, bool, bool, bool]:
+        """Packages with the same key can share a single package-manager invocation."""
+        return (self.provider, self.installed, self.cask, self.interactive)
+
+    def _may_be_satisfied(self) -> bool:
+        """Whether a listing of installed package names can show this is already done.
+
+        Only unpinned installs are checked. A name missing from the listing doesn't
+        prove a package is absent (brew aliases, tap-qualified or arch-qualified
+        names, held packages), so removals always run; so do pinned versions,
+        which can't be checked by name.
+        """
+        return self.installed and self.version is None
+
+    def _is_satisfied(self, installed: frozenset[str]) -> bool:
+        return (self.name in installed) == self.installed
+
+    @classmethod
+    def _pending(cls, group: list[PackageResource]) -> list[PackageResource]:
+        """Drop packages that are already in the desired state, using one query per group."""
+        if not any(r._may_be_satisfied() for r in group):
+            return group
+        first = group[0]
+        installed = _installed_packages(first.provider, first.cask)
+        if installed is None:
+            return group
+        return [r for r in group if not (r._may_be_satisfied() and r._is_satisfied(installed))]
+
+    @classmethod
+    def generate_batch(
+        cls,
+        resources: list[PackageResource],
+        *,
+        dry_run: bool = False,
+        show_diff: bool = False,
+    ) -> None:
+        """Generate several packages, sharing one package-manager call per run of equal provider/action.
+
+        Only consecutive packages with the same provider and action are combined,
+        so packages are still installed and removed in declaration order.
+        Subclasses that override generate() are never batched or skipped; their
+        generate() is called on its own.
+        Package managers resolve dependencies once per invocation, so installing
+        N packages in one call is much cheaper than N separate calls. If a batched
+        call fails, each package in it is retried individually so the failure can
+        be attributed to a specific package. Packages that are already installed
+        (or already absent) according to a single listing query per provider are
+        skipped without invoking the package manager.
+        """
+        if dry_run:
+            for resource in resources:
+                resource.generate(dry_run=True, show_diff=show_diff)
+            return
+
+        groups: list[list[PackageResource]] = []
+        for resource in resources:
+            if (
+                groups
+                and groups[-1][0]._batchable()
+                and resource._batchable()
+                and groups[-1][0]._batch_key() == resource._batch_key()
+            ):
+                groups[-1].append(resource)
             else:
-                cmd = ["brew", "uninstall"]
-                if self.cask:
-                    cmd.append("--cask")
-                cmd.append(self.name)
-                return cmd
-        elif self.provider == "mise":
-            if self.installed:
-                return ["mise", "use", "-g", spec]
+                groups.append([resource])
+
+        _prefetch_installed(
+            list(
+                dict.fromkeys(
+                    (group[0].provider, group[0].cask)
+                    for group in groups
+                    if group[0]._batchable() and any(r._may_be_satisfied() for r in group)
+                )
+            )
+        )
+
+        for group in groups:
+            pending = cls._pending(group) if group[0]._batchable() else group
+            if not pending:
+                continue
+
+            first = pending[0]
+            if len(pending) == 1:
+                first.generate(show_diff=show_diff)
             else:
-                return ["mise", "uninstall", self.name]
-        else:
-            raise ValueError(f"Unknown provider: {self.provider}")
+                cmd = [*first._command_prefix(), *(r._command_arg() for r in pending)]
+                result = subprocess.run(cmd, check=False, env=first._build_env())
+                if result.returncode != 0:
+                    for resource in pending:
+                        resource.generate(show_diff=show_diff)
+            _installed_cache.pop((first.provider, first.cask), None)
 
     def generate(self, *, dry_run: bool = False, show_diff: bool = False) -> None:
         cmd = self._build_command()
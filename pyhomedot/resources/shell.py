@@ -10,6 +10,8 @@ from pyhomedot.resources.base import Resource, noninteractive_env
 class ShellResource(Resource):
     """Runs arbitrary shell commands during generation."""
 
+    __slots__ = ("command", "cwd", "env", "interactive")
+
     def __init__(
         self,
         command: str,
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-import difflib
-import filecmp
+import errno
 import os
 import shutil
+import stat
+import threading
+from enum import Enum, auto
 from pathlib import Path
 
 from pyhomedot.color import BOLD, CYAN, DIM, GREEN, RED, YELLOW, color
@@ -14,18 +16,257 @@ from pyhomedot.resources.base import Resource
 _FORCE_SENTINEL: object = object()
 
 
-def _contents_match(a: Path, b: Path) -> bool:
-    """Check if two paths have identical content (works for files and directories)."""
-    if a.is_file() and b.is_file():
-        return filecmp.cmp(a, b, shallow=False)
-    if a.is_dir() and b.is_dir():
-        dcmp = filecmp.dircmp(a, b, ignore=[".git", ".jj", ".DS_Store", "node_modules", "__pycache__"])
-        if dcmp.left_only or dcmp.right_only or dcmp.diff_files:
-            return False
-        return all(_contents_match(a / sub, b / sub) for sub in dcmp.common_dirs)
+# stat() errors that mean "there is nothing usable at this path", matching
+# what Path.exists() treats as missing
+_MISSING_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.ELOOP})
+
+
+def _stat(path: str, *, follow_symlinks: bool = True) -> os.stat_result | None:
+    """Return stat() of path, or None if it doesn't exist."""
+    try:
+        return os.stat(path, follow_symlinks=follow_symlinks)
+    except OSError as e:
+        if e.errno in _MISSING_ERRNOS:
+            return None
+        raise
+
+
+def _lstat_mode(path: str) -> int | None:
+    """Return the file type bits of path (not following symlinks), or None if it doesn't exist."""
+    st = _stat(path, follow_symlinks=False)
+    return None if st is None else stat.S_IFMT(st.st_mode)
+
+
+def _entry_mode(entry: os.DirEntry[str]) -> int:
+    """Return the file type bits of a directory entry, from the listing when the OS provides them."""
+    if entry.is_symlink():
+        return stat.S_IFLNK
+    if entry.is_dir(follow_symlinks=False):
+        return stat.S_IFDIR
+    if entry.is_file(follow_symlinks=False):
+        return stat.S_IFREG
+    return stat.S_IFMT(entry.stat(follow_symlinks=False).st_mode)
+
+
+def _replace_with_symlink(source: str, target: str, *, target_is_directory: bool, dir_fd: int | None) -> None:
+    """Atomically swap a non-directory target for a symlink to source.
+
+    The link is created under a temporary name in the same directory and
+    renamed over the target, so the target path never goes missing. With
+    dir_fd, target is a name relative to that directory.
+    """
+    head, name = os.path.split(target)
+    tmp = os.path.join(head, f".{name}.pyhomedot-{os.getpid()}-{threading.get_ident()}")
+    os.symlink(source, tmp, target_is_directory=target_is_directory, dir_fd=dir_fd)
+    try:
+        os.replace(tmp, target, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+    except OSError:
+        os.unlink(tmp, dir_fd=dir_fd)
+        raise
+
+
+def _is_within(path: str, root: str) -> bool:
+    """Whether path is root or lies below it (lexically)."""
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+# Whether target directories can be held open and worked on by name
+_DIR_FD_SUPPORTED = (
+    {os.readlink, os.rename, os.symlink, os.unlink} <= os.supports_dir_fd
+    and os.scandir in os.supports_fd
+    and hasattr(os, "O_DIRECTORY")
+)
+
+# Target directories a batch keeps open at once; the least recently used one
+# is closed past this, so batches over many directories stay well inside the
+# descriptor limit (256 by default on macOS)
+_MAX_OPEN_DIRS = 8
+
+
+class _TargetListing:
+    """Target directory listings shared by a batch of symlinks.
+
+    Each parent directory is read once with os.scandir and the file types of
+    its entries are kept, so N targets in one directory cost one listing
+    instead of N lstat calls. Where the platform allows, the most recently
+    used directories stay open so links in them are read, removed and created
+    relative to their file descriptors, without the kernel walking the full
+    path each time. Changes made by the batch are recorded so later lookups
+    stay accurate.
+    """
+
+    def __init__(self) -> None:
+        # parent -> {name: file type bits}; None when the parent didn't exist
+        self._listings: dict[str, dict[str, int] | None] = {}
+        # parent -> open descriptor, least recently used first
+        self._fds: dict[str, int] = {}
+
+    def __enter__(self) -> _TargetListing:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+    def mode(self, target: str) -> int | None:
+        parent, name = os.path.split(target)
+        if parent not in self._listings:
+            self._listings[parent] = self._scan(parent)
+        listing = self._listings[parent]
+        return None if listing is None else listing.get(name)
+
+    def dir_fd(self, target: str) -> int | None:
+        """Return an open descriptor for target's parent, if one is held."""
+        parent = os.path.dirname(target)
+        fd = self._fds.pop(parent, None)
+        if fd is not None:
+            self._fds[parent] = fd
+        return fd
+
+    def _scan(self, parent: str) -> dict[str, int] | None:
+        try:
+            if not _DIR_FD_SUPPORTED:
+                with os.scandir(parent) as it:
+                    return {entry.name: _entry_mode(entry) for entry in it}
+            fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        self._fds[parent] = fd
+        if len(self._fds) > _MAX_OPEN_DIRS:
+            os.close(self._fds.pop(next(iter(self._fds))))
+        with os.scandir(fd) as it:
+            return {entry.name: _entry_mode(entry) for entry in it}
+
+    def _forget(self, parent: str) -> None:
+        del self._listings[parent]
+        fd = self._fds.pop(parent, None)
+        if fd is not None:
+            os.close(fd)
+
+    def changed(self, target: str) -> None:
+        """Forget what is known around target after a change the batch didn't track."""
+        parent = os.path.dirname(target)
+        for cached in [p for p in self._listings if _is_within(parent, p) or _is_within(p, target)]:
+            self._forget(cached)
+
+    def linked(self, target: str) -> None:
+        """Record that target is now a symlink."""
+        parent, name = os.path.split(target)
+        if self._listings.get(parent, {}) is None:
+            # The parent (and possibly its ancestors) was just created; forget
+            # listings that predate that
+            for cached in [p for p in self._listings if _is_within(parent, p)]:
+                self._forget(cached)
+        listing = self._listings.get(parent)
+        if listing is not None:
+            listing[name] = stat.S_IFLNK
+        # Whatever used to live below the target is gone
+        for cached in [p for p in self._listings if _is_within(p, target)]:
+            self._forget(cached)
+
+
+def _same_file(path: str, st: os.stat_result) -> bool:
+    """Whether path (following symlinks) is the file st was taken from; False if it's missing."""
+    try:
+        return os.path.samestat(os.stat(path), st)
+    except OSError:
+        return False
+
+
+# Read size for content comparison; measured faster than both filecmp's 8 KiB
+# reads and mmap for large files
+_COMPARE_CHUNK = 64 * 1024
+
+# Entries that are skipped when comparing or diffing directories
+_IGNORED_NAMES = frozenset({".git", ".jj", ".DS_Store", "node_modules", "__pycache__"})
+
+
+def _files_equal(a: str | Path, b: str | Path, *, b_size: int | None = None) -> bool:
+    """Compare two files byte for byte, rejecting on size before reading anything.
+
+    b_size, if already known, saves a stat of b.
+    """
+    if os.path.getsize(a) != (os.path.getsize(b) if b_size is None else b_size):
+        return False
+    return _same_bytes(a, b)
+
+
+def _same_bytes(a: str | Path, b: str | Path) -> bool:
+    """Compare two files already known to be the same size, stopping at the first difference."""
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            chunk = fa.read(_COMPARE_CHUNK)
+            if chunk != fb.read(_COMPARE_CHUNK):
+                return False
+            if not chunk:
+                return True
+
+
+def _contents_match(a: str, b: str, a_mode: int, b_st: os.stat_result) -> bool:
+    """Check if two paths have identical content (works for files and directories).
+
+    a_mode is a's already known file type bits and b_st is b's stat().
+    """
+    if a_mode != stat.S_IFMT(b_st.st_mode):
+        return False
+    if stat.S_ISREG(a_mode):
+        return _files_equal(a, b, b_size=b_st.st_size)
+    if stat.S_ISDIR(a_mode):
+        return _dirs_match(a, b)
     return False
 
 
+def _scan_dir(path: str) -> dict[str, os.DirEntry[str]]:
+    with os.scandir(path) as it:
+        return {entry.name: entry for entry in it if entry.name not in _IGNORED_NAMES}
+
+
+def _dirs_match(a: str, b: str) -> bool:
+    """Recursively compare two directory trees with one scandir per directory.
+
+    DirEntry caches the file type from the directory listing, so classifying
+    entries costs no extra stat calls. Names, types and file sizes of the whole
+    tree are checked before any file is read, so a mismatch anywhere is found
+    without reading contents. Entries that are neither files nor directories
+    (e.g. broken symlinks) never match.
+    """
+    files: list[tuple[int, str, str]] = []
+    if not _shapes_match(a, b, files):
+        return False
+    # Sizes were matched while walking, so only the bytes are left to compare.
+    # Small files first: they are cheap to check and a difference ends the walk.
+    files.sort(key=lambda f: f[0])
+    return all(_same_bytes(fa, fb) for _, fa, fb in files)
+
+
+def _shapes_match(a: str, b: str, files: list[tuple[int, str, str]]) -> bool:
+    """Check that two trees have the same names, types and file sizes.
+
+    Pairs of files still to be compared by content are appended to files
+    along with their size.
+    """
+    a_entries = _scan_dir(a)
+    b_entries = _scan_dir(b)
+    if a_entries.keys() != b_entries.keys():
+        return False
+    subdirs: list[tuple[str, str]] = []
+    for name, a_entry in a_entries.items():
+        b_entry = b_entries[name]
+        if a_entry.is_dir():
+            if not b_entry.is_dir():
+                return False
+            subdirs.append((a_entry.path, b_entry.path))
+        elif a_entry.is_file():
+            size = a_entry.stat().st_size
+            if not (b_entry.is_file() and size == b_entry.stat().st_size):
+                return False
+            files.append((size, a_entry.path, b_entry.path))
+        else:
+            return False
+    return all(_shapes_match(da, db, files) for da, db in subdirs)
+
+
 def _read_text_safe(path: Path) -> str | None:
     """Read file as text, return None if binary or unreadable."""
     try:
@@ -36,6 +277,9 @@ def _read_text_safe(path: Path) -> str | None:
 
 def _show_file_diff(existing: Path, source: Path, label: str) -> None:
     """Show a unified diff between existing file and source file."""
+    # Only needed for --diff, so keep it off the import path
+    import difflib
+
     existing_text = _read_text_safe(existing)
     source_text = _read_text_safe(source)
 
@@ -55,32 +299,34 @@ def _show_file_diff(existing: Path, source: Path, label: str) -> None:
         print(f"    {color('(files are identical)', DIM)}")
         return
 
+    # Colour every line first and write the whole diff at once
+    out: list[str] = []
     for line in diff:
         line = line.rstrip("\n")
         if line.startswith("+++") or line.startswith("---"):
-            print(f"    {color(line, BOLD)}")
+            out.append(f"    {color(line, BOLD)}")
         elif line.startswith("+"):
-            print(f"    {color(line, GREEN)}")
+            out.append(f"    {color(line, GREEN)}")
         elif line.startswith("-"):
-            print(f"    {color(line, RED)}")
+            out.append(f"    {color(line, RED)}")
         elif line.startswith("@@"):
-            print(f"    {color(line, CYAN)}")
+            out.append(f"    {color(line, CYAN)}")
         else:
-            print(f"    {line}")
+            out.append(f"    {line}")
+    print("\n".join(out))
 
 
 def _show_dir_diff(existing: Path, source: Path) -> None:
     """Show a summary and file-level diffs for two directories."""
-    ignore = {".git", ".jj", ".DS_Store", "node_modules", "__pycache__"}
     existing_files = {
         p.relative_to(existing)
         for p in existing.rglob("*")
-        if p.is_file() and not (set(p.parts) & ignore)
+        if p.is_file() and _IGNORED_NAMES.isdisjoint(p.parts)
     }
     source_files = {
         p.relative_to(source)
         for p in source.rglob("*")
-        if p.is_file() and not (set(p.parts) & ignore)
+        if p.is_file() and _IGNORED_NAMES.isdisjoint(p.parts)
     }
 
     only_existing = sorted(existing_files - source_files)
@@ -96,7 +342,7 @@ def _show_dir_diff(existing: Path, source: Path) -> None:
         for f in only_source:
             print(f"      {f}")
 
-    differing = [f for f in common if not filecmp.cmp(existing / f, source / f, shallow=False)]
+    differing = [f for f in common if not _files_equal(existing / f, source / f)]
     if differing:
         print(f"    {color('Files with differences:', CYAN)}")
         for f in differing:
@@ -107,9 +353,56 @@ def _show_dir_diff(existing: Path, source: Path) -> None:
         print(f"    {color('(directories are identical)', DIM)}")
 
 
+# Below this many symlinks a batch runs serially; starting threads costs more
+# than overlapping a handful of syscalls saves.
+_PARALLEL_THRESHOLD = 8
+
+# Upper bound on worker threads used for one batch.
+_MAX_WORKERS = 32
+
+
+# A resource paired with its resolved target path
+_Planned = tuple["SymlinkResource", str]
+
+
+def _parent_groups(planned: list[_Planned]) -> list[list[_Planned]] | None:
+    """Group resources by target parent directory, keeping their order within each group.
+
+    Returns None if a target is, or contains, another group's parent directory:
+    those resources depend on each other and must run in order.
+    """
+    groups: dict[str, list[_Planned]] = {}
+    targets: set[str] = set()
+    for resource, target in planned:
+        targets.add(target)
+        groups.setdefault(os.path.dirname(target), []).append((resource, target))
+
+    for parent in groups:
+        path = parent
+        while True:
+            if path in targets:
+                return None
+            head = os.path.dirname(path)
+            if head == path:
+                break
+            path = head
+    return list(groups.values())
+
+
+class _TargetState(Enum):
+    """What currently sits at a symlink's target path."""
+
+    MISSING = auto()
+    LINKED = auto()  # symlink already pointing at the source
+    MISLINKED = auto()  # symlink pointing somewhere else
+    OCCUPIED = auto()  # regular file, directory or other non-link
+
+
 class SymlinkResource(Resource):
     """Creates symlinks from source files/directories to target locations relative to $HOME."""
 
+    __slots__ = ("source", "target", "_force_explicit", "force", "_source_root", "_home_dir")
+
     def __init__(
         self,
         source: str,
@@ -126,13 +419,15 @@ class SymlinkResource(Resource):
         self._source_root = source_root or Path.cwd()
         self._home_dir = home_dir or Path.home()
 
-    def _resolve_source(self) -> Path:
-        return (self._source_root / self.source).resolve()
+    # Paths stay plain strings from here on: every consumer is an os function,
+    # so building Path objects would only add conversions.
+    def _resolve_source(self) -> str:
+        return os.path.realpath(os.path.join(self._source_root, self.source))
 
-    def _resolve_target(self) -> Path:
+    def _resolve_target(self) -> str:
         # Strip trailing slash for path resolution
         target = self.target.rstrip("/")
-        return self._home_dir / target
+        return os.path.join(self._home_dir, target)
 
     def _short_target(self) -> str:
         """Return ~/relative target path for display."""
@@ -143,43 +438,124 @@ class SymlinkResource(Resource):
         if not self._force_explicit and cli_force:
             self.force = True
 
+    @classmethod
+    def generate_batch(
+        cls,
+        resources: list[SymlinkResource],
+        *,
+        dry_run: bool = False,
+        show_diff: bool = False,
+    ) -> None:
+        """Generate several symlinks, reading each target directory only once.
+
+        The existing state of targets comes from one os.scandir per parent
+        directory instead of an lstat per target. Larger real runs whose target
+        directories don't overlap are spread over a thread pool, one parent
+        directory per task; otherwise resources are processed in order. A
+        failing resource doesn't stop the others; the first error is raised at
+        the end. Subclasses that override generate() are called through it.
+        """
+        # Resolve every target once for the whole batch
+        planned = [(resource, resource._resolve_target()) for resource in resources]
+        groups = None if dry_run or len(planned) < _PARALLEL_THRESHOLD else _parent_groups(planned)
+        if groups is None or len(groups) < 2:
+            cls._generate_group(planned, dry_run=dry_run, show_diff=show_diff)
+            return
+
+        # concurrent.futures pulls in logging; only pay for it when needed
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(groups))) as executor:
+            futures = [executor.submit(cls._generate_group, group, show_diff=show_diff) for group in groups]
+
+        # Let every group finish before surfacing the first failure
+        errors = [e for e in (f.exception() for f in futures) if e is not None]
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _generate_group(planned: list[_Planned], *, dry_run: bool = False, show_diff: bool = False) -> None:
+        """Generate resources in order from one shared set of directory listings.
+
+        A failing resource doesn't stop the rest of the group; the first error
+        is raised once every resource has run.
+        """
+        errors: list[Exception] = []
+        with _TargetListing() as listing:
+            for resource, target in planned:
+                try:
+                    if type(resource).generate is not SymlinkResource.generate:
+                        # Subclasses that override generate() run as written
+                        resource.generate(dry_run=dry_run, show_diff=show_diff)
+                        listing.changed(target)
+                    elif resource._generate(
+                        target,
+                        listing.mode(target),
+                        dry_run=dry_run,
+                        show_diff=show_diff,
+                        dir_fd=listing.dir_fd(target),
+                    ):
+                        listing.linked(target)
+                except Exception as e:
+                    listing.changed(target)
+                    errors.append(e)
+        if errors:
+            raise errors[0]
+
     def generate(self, *, dry_run: bool = False, show_diff: bool = False) -> None:
-        source = self._resolve_source()
         target = self._resolve_target()
+        self._generate(target, _lstat_mode(target), dry_run=dry_run, show_diff=show_diff)
+
+    def _generate(
+        self,
+        target: str,
+        target_mode: int | None,
+        *,
+        dry_run: bool,
+        show_diff: bool,
+        dir_fd: int | None = None,
+    ) -> bool:
+        """Bring target in line with the source, given its current file type.
+
+        dir_fd, if given, is an open descriptor for the target's parent directory.
+        Returns True if a symlink was created.
+        """
+        # Name the target relative to dir_fd when there is one
+        target_at = os.path.basename(target) if dir_fd is not None else target
+        source = self._resolve_source()
         label = self._short_target()
 
-        if not source.exists():
+        # One stat of the source answers "does it exist", "is it a directory" and,
+        # for links that don't name it verbatim, "is this the same file"
+        source_st = _stat(source)
+        if source_st is None:
             if dry_run:
                 print(f"  {color('MISSING', RED)}  source does not exist: {source}")
-                return
+                return False
             raise FileNotFoundError(f"Source does not exist: {source}")
 
-        # Check current state of target
-        if target.exists() or target.is_symlink():
-            if target.is_symlink():
-                existing_target = Path(os.readlink(str(target))).resolve()
-                if existing_target == source:
-                    # Already correct symlink
-                    if dry_run:
-                        print(f"  {color('OK', GREEN)}       {color(label, DIM)}")
-                    return
-
-                # Symlink pointing elsewhere
+        state, existing_target = self._classify(target, target_at, target_mode, source, source_st, dir_fd)
+        match state, target_mode:
+            case _TargetState.LINKED, _:
+                if dry_run:
+                    print(f"  {color('OK', GREEN)}       {color(label, DIM)}")
+                return False
+
+            case _TargetState.MISLINKED, _:
                 if dry_run:
                     print(f"  {color('RELINK', YELLOW)}   {label} {color(f'(currently -> {existing_target})', DIM)}")
                     if not self.force:
                         print(f"           {color('^ would skip (force=False)', DIM)}")
-                    return
-                if self.force:
-                    target.unlink()
-                else:
+                    return False
+                if not self.force:
                     print(f"{color('Warning:', YELLOW)} {target} is already a symlink to {existing_target}, skipping (use force=True to overwrite)")
-                    return
-            else:
-                # Regular file or directory
-                kind = "directory" if target.is_dir() else "file"
-                identical = _contents_match(target, source)
+                    return False
+
+            case _TargetState.OCCUPIED, int(mode):
+                target_is_dir = stat.S_ISDIR(mode)
+                kind = "directory" if target_is_dir else "file"
                 if dry_run:
+                    identical = _contents_match(target, source, mode, source_st)
                     if identical:
                         print(f"  {color('IDENTICAL', CYAN)} {label} {color(f'(existing {kind}, same content — safe to replace)', DIM)}")
                     elif self.force:
@@ -187,25 +563,66 @@ class SymlinkResource(Resource):
                     else:
                         print(f"  {color('CONFLICT', RED)} {label} {color(f'(existing {kind}, would skip)', DIM)}")
                     if show_diff and not identical:
-                        if target.is_dir():
-                            _show_dir_diff(target, source)
+                        if target_is_dir:
+                            _show_dir_diff(Path(target), Path(source))
                         else:
-                            _show_file_diff(target, source, self.target)
-                    return
-                if self.force or identical:
-                    if target.is_dir():
-                        shutil.rmtree(target)
-                    else:
-                        target.unlink()
-                else:
+                            _show_file_diff(Path(target), Path(source), self.target)
+                    return False
+                # With force the target is replaced either way, so skip reading its contents
+                if not (self.force or _contents_match(target, source, mode, source_st)):
                     print(f"{color('Warning:', YELLOW)} {target} already exists and is not a symlink, skipping (use force=True to overwrite)")
-                    return
-        else:
-            # Target doesn't exist — will create
-            if dry_run:
-                print(f"  {color('CREATE', GREEN)}   {color(label, BOLD)} -> {source}")
-                return
+                    return False
+
+            case _TargetState.MISSING, _:
+                if dry_run:
+                    print(f"  {color('CREATE', GREEN)}   {color(label, BOLD)} -> {source}")
+                    return False
 
-        # Create parent directories and symlink
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.symlink_to(source)
+        source_is_dir = stat.S_ISDIR(source_st.st_mode)
+        if target_mode is not None and not stat.S_ISDIR(target_mode):
+            # Files and links are swapped in one rename
+            _replace_with_symlink(source, target_at, target_is_directory=source_is_dir, dir_fd=dir_fd)
+            return True
+
+        # A directory can't be renamed over, so remove it first
+        if target_mode is not None:
+            shutil.rmtree(target)
+        # Create the link straight away; parent directories are only made when it turns out they're missing
+        try:
+            os.symlink(source, target_at, target_is_directory=source_is_dir, dir_fd=dir_fd)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.symlink(source, target, target_is_directory=source_is_dir)
+        except FileExistsError:
+            # Something appeared at the target after it was inspected; decide again from its real state
+            return self._generate(target, _lstat_mode(target), dry_run=dry_run, show_diff=show_diff)
+        return True
+
+    @staticmethod
+    def _classify(
+        target: str,
+        target_at: str,
+        target_mode: int | None,
+        source: str,
+        source_st: os.stat_result,
+        dir_fd: int | None,
+    ) -> tuple[_TargetState, str]:
+        """Work out the target's state from its file type, reading the link only for symlinks.
+
+        Returns the state and, for symlinks, where the link points.
+        """
+        if target_mode is None:
+            return _TargetState.MISSING, ""
+        if not stat.S_ISLNK(target_mode):
+            return _TargetState.OCCUPIED, ""
+        link = os.readlink(target_at, dir_fd=dir_fd)
+        # Relative links are relative to the link's own directory. Links we create
+        # hold the resolved source verbatim, so comparing strings settles the common
+        # case without touching the filesystem; samefile() is the fallback.
+        if os.path.isabs(link):
+            existing_target = link
+        else:
+            existing_target = os.path.normpath(os.path.join(os.path.dirname(target), link))
+        if existing_target == source or _same_file(target, source_st):
+            return _TargetState.LINKED, existing_target
+        return _TargetState.MISLINKED, existing_target
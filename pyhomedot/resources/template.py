@@ -14,6 +14,8 @@ class TemplateResource(Resource):
     Uses {{ variable }} (Jinja2-style) syntax for template substitution.
     """
 
+    __slots__ = ("source", "target", "variables", "force", "_source_root", "_home_dir")
+
     def __init__(
         self,
         source: str,
@@ -0,0 +1,19 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from pyhomedot.resources.package import _installed_cache
+
+
+@pytest.fixture(autouse=True)
+def _isolate_installed_packages_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Don't let one test's mocked package listing leak into another or into ~/.cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    _installed_cache.clear()
+    yield
+    _installed_cache.clear()
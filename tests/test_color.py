@@ -0,0 +1,36 @@
+"""Tests for the ANSI color helpers."""
+
+from __future__ import annotations
+
+import io
+from unittest.mock import patch
+
+from pyhomedot.color import RED, RESET, color
+
+
+class _TtyStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.isatty_calls = 0
+
+    def isatty(self) -> bool:
+        self.isatty_calls += 1
+        return True
+
+
+class TestColor:
+    """Test terminal detection for colored output."""
+
+    def test_plain_text_when_not_a_tty(self) -> None:
+        with patch("sys.stdout", io.StringIO()):
+            assert color("hi", RED) == "hi"
+
+    def test_tty_check_is_cached_per_stream(self) -> None:
+        stream = _TtyStream()
+        with patch("sys.stdout", stream):
+            assert color("a", RED) == f"{RED}a{RESET}"
+            assert color("b", RED) == f"{RED}b{RESET}"
+        assert stream.isatty_calls == 1
+
+        with patch("sys.stdout", io.StringIO()):
+            assert color("c", RED) == "c"
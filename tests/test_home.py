@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+import pyhomedot.home as home_module
 from pyhomedot import Home
+from pyhomedot.resources import PackageResource, ShellResource, SymlinkResource, TemplateResource
 from pyhomedot.resources.base import Resource
 
 
@@ -37,6 +39,17 @@ class TestResource:
         r = GoodResource()
         assert isinstance(r, Resource)
 
+    def test_builtin_resources_use_slots(self) -> None:
+        """Built-in resources store attributes in slots, not a per-instance __dict__."""
+        resources: list[Resource] = [
+            PackageResource("htop", "apt"),
+            ShellResource("echo hi"),
+            TemplateResource("a.tmpl", "a", variables={}),
+            SymlinkResource("a", "a"),
+        ]
+        for r in resources:
+            assert not hasattr(r, "__dict__")
+
 
 class TestHome:
     """Test the Home orchestrator."""
@@ -68,6 +81,14 @@ class TestHome:
         home = Home()
         home.generate()  # should not raise
 
+    def test_home_generate_empty_dry_run_skips_legend(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Dry run with no resources prints only the summary."""
+        home = Home()
+        home.generate(dry_run=True)
+        captured = capsys.readouterr()
+        assert "Legend" not in captured.out
+        assert "0 resources checked" in captured.out
+
     def test_home_add_resource(self) -> None:
         """Can add resources via add() method."""
         home = Home()
@@ -90,3 +111,47 @@ class TestHome:
         r = MagicMock(spec=Resource)
         result = home.add(r)
         assert result is home
+
+    def test_home_generate_batches_consecutive_symlinks(self) -> None:
+        """A run of symlinks is handed to SymlinkResource.generate_batch in one call."""
+        home = Home()
+        links = [SymlinkResource(n, n) for n in ("a", "b")]
+        shell = ShellResource("true")
+        home.add(*links, shell, SymlinkResource("c", "c"))
+        with patch.object(SymlinkResource, "generate_batch") as mock_batch, patch.object(
+            SymlinkResource, "generate"
+        ) as mock_generate, patch.object(ShellResource, "generate"):
+            home.generate(dry_run=False, force=False, show_diff=False)
+        mock_batch.assert_called_once_with(links, show_diff=False)
+        mock_generate.assert_called_once_with(dry_run=False, show_diff=False)
+
+    def test_home_generate_serial_resource_keeps_order(self) -> None:
+        """Resources that can't be batched run in declaration order."""
+        home = Home()
+        calls: list[str] = []
+
+        def recorder(name: str) -> MagicMock:
+            r = MagicMock(spec=Resource)
+            r.generate.side_effect = lambda **kwargs: calls.append(name)
+            return r
+
+        home.add(recorder("a"), recorder("b"), recorder("c"))
+        home.generate()
+        assert calls == ["a", "b", "c"]
+
+    def test_home_generate_reuses_plan_until_resources_change(self) -> None:
+        """Repeated generate() calls only re-plan after the resource list changes."""
+        home = Home()
+        r1 = MagicMock(spec=Resource)
+        home.add(r1)
+        with patch("pyhomedot.home._runs", wraps=home_module._runs) as mock_runs:
+            home.generate()
+            home.generate()
+            assert mock_runs.call_count == 1
+
+            r2 = MagicMock(spec=Resource)
+            home.resources.append(r2)
+            home.generate()
+            assert mock_runs.call_count == 2
+        assert r1.generate.call_count == 3
+        r2.generate.assert_called_once_with(dry_run=False, show_diff=False)
@@ -59,7 +59,111 @@ class TestFullWorkflow:
         assert "{{ username }}" not in gitconfig.read_text()
 
         # Verify package install was called
-        mock_run.assert_called_once()
+        cmds = [c[0][0] for c in mock_run.call_args_list]
+        assert cmds.count(["apt-get", "install", "-y", "git"]) == 1
+
+    def test_template_inside_symlinked_directory(self, tmp_path: Path) -> None:
+        """A template targeting a path inside a neighbouring symlink's target runs after the symlink."""
+        # Repeat to catch the two resources racing each other
+        for i in range(20):
+            source_dir = tmp_path / f"project{i}"
+            (source_dir / "nvim").mkdir(parents=True)
+            (source_dir / "nvim" / "init.lua").write_text("-- init")
+            (source_dir / "local.lua.tmpl").write_text("vim.g.user = '{{ user }}'")
+            home_dir = tmp_path / f"home{i}"
+
+            home = Home()
+            home.add(
+                SymlinkResource("nvim", ".config/nvim", source_root=source_dir, home_dir=home_dir),
+                TemplateResource(
+                    "local.lua.tmpl",
+                    ".config/nvim/local.lua",
+                    variables={"user": "me"},
+                    source_root=source_dir,
+                    home_dir=home_dir,
+                ),
+            )
+            home.generate(dry_run=False, force=False, show_diff=False)
+
+            assert (home_dir / ".config" / "nvim").is_symlink()
+            assert (source_dir / "nvim" / "local.lua").read_text() == "vim.g.user = 'me'"
+
+    def test_failing_symlink_does_not_stop_its_neighbours(self, tmp_path: Path) -> None:
+        """A missing source is reported after the other symlinks in its group have been created."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "b").write_text("b")
+        (source_dir / "c").write_text("c")
+        home_dir = tmp_path / "home"
+
+        home = Home()
+        home.add(*(SymlinkResource(n, n, source_root=source_dir, home_dir=home_dir) for n in ("missing", "b", "c")))
+        with pytest.raises(FileNotFoundError):
+            home.generate(dry_run=False, force=False, show_diff=False)
+
+        assert (home_dir / "b").is_symlink()
+        assert (home_dir / "c").is_symlink()
+        assert not (home_dir / "missing").exists()
+
+    def test_symlink_subclass_generate_override_is_used(self, tmp_path: Path) -> None:
+        """Neighbouring symlinks are batched, but an overridden generate() still runs for each of them."""
+        calls: list[str] = []
+
+        class RecordingSymlink(SymlinkResource):
+            __slots__ = ()
+
+            def generate(self, *, dry_run: bool = False, show_diff: bool = False) -> None:
+                calls.append(self.target)
+                super().generate(dry_run=dry_run, show_diff=show_diff)
+
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        for n in ("a", "b"):
+            (source_dir / n).write_text(n)
+        home_dir = tmp_path / "home"
+
+        home = Home()
+        home.add(
+            RecordingSymlink("a", "a", source_root=source_dir, home_dir=home_dir),
+            SymlinkResource("b", "b", source_root=source_dir, home_dir=home_dir),
+            RecordingSymlink("b", "b", source_root=source_dir, home_dir=home_dir),
+        )
+        home.generate(dry_run=False, force=False, show_diff=False)
+
+        assert calls == ["a", "b"]
+        assert (home_dir / "a").is_symlink()
+        assert (home_dir / "b").is_symlink()
+
+    def test_package_subclass_generate_override_is_used(self) -> None:
+        """Neighbouring packages are batched, but an overridden generate() still runs for each of them."""
+        calls: list[str] = []
+
+        class RecordingPackage(PackageResource):
+            __slots__ = ()
+
+            def generate(self, *, dry_run: bool = False, show_diff: bool = False) -> None:
+                calls.append(self.name)
+                super().generate(dry_run=dry_run, show_diff=show_diff)
+
+        home = Home()
+        home.add(
+            RecordingPackage("a", "mise"),
+            RecordingPackage("b", "mise"),
+            PackageResource("c", "mise"),
+            PackageResource("d", "mise"),
+        )
+        with patch("pyhomedot.resources.package.subprocess.run") as mock_run, patch(
+            "pyhomedot.resources.package._installed_packages", return_value=None
+        ):
+            mock_run.return_value = MagicMock(returncode=0)
+            home.generate(dry_run=False, force=False, show_diff=False)
+
+        assert calls == ["a", "b"]
+        assert [c.args[0] for c in mock_run.call_args_list] == [
+            ["mise", "use", "-g", "a"],
+            ["mise", "use", "-g", "b"],
+            ["mise", "use", "-g", "c", "d"],
+        ]
 
     def test_dry_run_full_workflow(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
         """Dry run across all resource types prints but doesn't change anything."""
@@ -151,6 +255,29 @@ class TestFullWorkflow:
             assert "node@20" in calls[0][0][0]
             assert "python@3.12" in calls[1][0][0]
 
+    def test_consecutive_packages_are_batched(self) -> None:
+        """Neighbouring packages share one call; a shell command in between splits the batch."""
+        home = Home()
+        home.add(
+            PackageResource("git", "apt"),
+            PackageResource("curl", "apt"),
+            ShellResource("echo between"),
+            PackageResource("htop", "apt"),
+        )
+
+        with (
+            patch("subprocess.run") as mock_run,
+            patch("pyhomedot.resources.package._installed_packages", return_value=frozenset()),
+        ):
+            mock_run.return_value = MagicMock(returncode=0)
+            home.generate()
+
+            calls = mock_run.call_args_list
+            assert len(calls) == 3
+            assert calls[0][0][0] == ["apt-get", "install", "-y", "git", "curl"]
+            assert calls[1][0][0] == "echo between"
+            assert calls[2][0][0] == ["apt-get", "install", "-y", "htop"]
+
     def test_shell_resource_in_workflow(self) -> None:
         """ShellResource integrates with Home.generate()."""
         home = Home()
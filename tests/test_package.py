@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import os
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
 from pyhomedot.resources import PackageResource
+from pyhomedot.resources.package import _installed_cache, _installed_packages
 
 
 class TestPackageResource:
@@ -211,3 +216,190 @@ class TestPackageResource:
         r.generate(dry_run=True)
         captured = capsys.readouterr()
         assert "node@20" in captured.out or "20" in captured.out
+
+
+@pytest.fixture
+def installed_packages() -> Iterator[MagicMock]:
+    """Mock the installed-package listing; reports nothing installed by default."""
+    with patch("pyhomedot.resources.package._installed_packages", return_value=frozenset()) as mock:
+        yield mock
+
+
+@pytest.mark.usefixtures("installed_packages")
+class TestPackageBatch:
+    """Test batching several packages into one package-manager call."""
+
+    def test_batch_installs_in_one_call(self) -> None:
+        resources = [PackageResource("htop", "apt"), PackageResource("curl", "apt", version="8.0")]
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            PackageResource.generate_batch(resources)
+            mock_run.assert_called_once()
+            assert mock_run.call_args[0][0] == ["apt-get", "install", "-y", "htop", "curl=8.0"]
+
+    def test_batch_groups_consecutive_provider_and_action(self, installed_packages: MagicMock) -> None:
+        installed_packages.return_value = frozenset({"wget"})
+        resources = [
+            PackageResource("htop", "brew"),
+            PackageResource("node", "mise"),
+            PackageResource("wget", "brew", installed=False),
+            PackageResource("jq", "brew"),
+            PackageResource("yq", "brew"),
+            PackageResource("firefox", "brew", cask=True),
+        ]
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+            PackageResource.generate_batch(resources)
+            cmds = [c[0][0] for c in mock_run.call_args_list]
+            assert cmds == [
+                ["brew", "install", "htop"],
+                ["mise", "use", "-g", "node"],
+                ["brew", "uninstall", "wget"],
+                ["brew", "install", "jq", "yq"],
+                ["brew", "install", "--cask", "firefox"],
+            ]
+
+    def test_failed_batch_retries_individually(self, capsys: pytest.CaptureFixture[str]) -> None:
+        resources = [PackageResource("htop", "apt"), PackageResource("nope", "apt")]
+
+        def fake_run(cmd: list[str], **kwargs: object) -> MagicMock:
+            return MagicMock(returncode=100 if "nope" in cmd else 0)
+
+        with patch("subprocess.run", side_effect=fake_run) as mock_run:
+            PackageResource.generate_batch(resources)
+            assert mock_run.call_count == 3
+        captured = capsys.readouterr()
+        assert "'nope'" in captured.out
+        assert "'htop'" not in captured.out
+
+    def test_batch_dry_run_does_not_execute(self) -> None:
+        resources = [PackageResource("htop", "apt"), PackageResource("curl", "apt")]
+        with patch("subprocess.run") as mock_run:
+            PackageResource.generate_batch(resources, dry_run=True)
+            mock_run.assert_not_called()
+
+
+class TestInstalledPrefilter:
+    """Test skipping packages that are already in the desired state."""
+
+    @staticmethod
+    def fake_run(listing: str) -> MagicMock:
+        def run(cmd: list[str], **kwargs: object) -> MagicMock:
+            if cmd[0] == "dpkg-query" or cmd[:2] == ["brew", "list"]:
+                return MagicMock(returncode=0, stdout=listing)
+            return MagicMock(returncode=0)
+
+        return MagicMock(side_effect=run)
+
+    def test_skips_installed_apt_packages(self) -> None:
+        resources = [PackageResource("htop", "apt"), PackageResource("curl", "apt"), PackageResource("jq", "apt")]
+        listing = "ii  htop\nrc  curl\nii  git\n"
+        with patch("subprocess.run", self.fake_run(listing)) as mock_run:
+            PackageResource.generate_batch(resources)
+            cmds = [c[0][0] for c in mock_run.call_args_list]
+            assert cmds[0][0] == "dpkg-query"
+            assert cmds[1:] == [["apt-get", "install", "-y", "curl", "jq"]]
+
+    def test_query_discards_stderr(self) -> None:
+        resources = [PackageResource("htop", "apt")]
+        with patch("subprocess.run", self.fake_run("ii  htop\n")) as mock_run:
+            PackageResource.generate_batch(resources)
+            kwargs = mock_run.call_args_list[0][1]
+            assert kwargs["stdout"] == subprocess.PIPE
+            assert kwargs["stderr"] == subprocess.DEVNULL
+
+    def test_queries_all_providers_before_installing(self) -> None:
+        resources = [PackageResource("htop", "apt"), PackageResource("jq", "brew"), PackageResource("git", "brew", cask=True)]
+        with patch("subprocess.run", self.fake_run("")) as mock_run:
+            PackageResource.generate_batch(resources)
+            cmds = [c[0][0] for c in mock_run.call_args_list]
+            assert {cmds[0][0], cmds[1][0], cmds[2][0]} == {"dpkg-query", "brew"}
+            assert ["apt-get", "install", "-y", "htop"] in cmds[3:]
+
+    def test_install_keeps_other_providers_listings(self) -> None:
+        """Installing with one provider doesn't throw away the listings prefetched for the others."""
+        resources = [PackageResource("htop", "apt"), PackageResource("jq", "brew")]
+        with (
+            patch("pyhomedot.resources.package._package_db", return_value=None),
+            patch("subprocess.run", self.fake_run("")) as mock_run,
+        ):
+            PackageResource.generate_batch(resources)
+            cmds = [c[0][0] for c in mock_run.call_args_list]
+            assert cmds.count(["brew", "list", "--formula", "-1"]) == 1
+            assert cmds[-2:] == [["apt-get", "install", "-y", "htop"], ["brew", "install", "jq"]]
+
+    def test_all_installed_skips_package_manager(self) -> None:
+        resources = [PackageResource("htop", "brew"), PackageResource("jq", "brew")]
+        with patch("subprocess.run", self.fake_run("htop\njq\n")) as mock_run:
+            PackageResource.generate_batch(resources)
+            assert mock_run.call_count == 1
+
+    def test_uninstall_runs_even_when_name_is_not_listed(self) -> None:
+        """Names can be listed differently (aliases, libfoo:i386), so removals are never skipped."""
+        resources = [PackageResource("libfoo", "apt", installed=False), PackageResource("git", "apt", installed=False)]
+        with patch("subprocess.run", self.fake_run("ii  libfoo:i386\nii  git\n")) as mock_run:
+            PackageResource.generate_batch(resources)
+            mock_run.assert_called_once()
+            assert mock_run.call_args[0][0] == ["apt-get", "remove", "-y", "libfoo", "git"]
+
+    def test_versioned_packages_are_not_queried(self) -> None:
+        resources = [PackageResource("htop", "apt", version="3.2.1")]
+        with patch("subprocess.run", self.fake_run("ii  htop\n")) as mock_run:
+            PackageResource.generate_batch(resources)
+            mock_run.assert_called_once()
+            assert mock_run.call_args[0][0] == ["apt-get", "install", "-y", "htop=3.2.1"]
+
+    def test_mise_is_never_queried(self) -> None:
+        resources = [PackageResource("node", "mise")]
+        with patch("subprocess.run", self.fake_run("")) as mock_run:
+            PackageResource.generate_batch(resources)
+            mock_run.assert_called_once()
+            assert mock_run.call_args[0][0] == ["mise", "use", "-g", "node"]
+
+    def test_failed_query_installs_everything(self) -> None:
+        resources = [PackageResource("htop", "apt")]
+        with patch("subprocess.run", side_effect=[FileNotFoundError(), MagicMock(returncode=0)]) as mock_run:
+            PackageResource.generate_batch(resources)
+            assert mock_run.call_args[0][0] == ["apt-get", "install", "-y", "htop"]
+
+
+class TestInstalledDiskCache:
+    """Test the on-disk cache of installed packages."""
+
+    def test_reuses_listing_while_database_unchanged(self, tmp_path: Path) -> None:
+        db = tmp_path / "status"
+        db.write_text("")
+        with (
+            patch("pyhomedot.resources.package._package_db", return_value=db),
+            patch("subprocess.run", return_value=MagicMock(returncode=0, stdout="ii  htop\n")) as mock_run,
+        ):
+            assert _installed_packages("apt", False) == frozenset({"htop"})
+            _installed_cache.clear()
+            assert _installed_packages("apt", False) == frozenset({"htop"})
+            mock_run.assert_called_once()
+
+    def test_requeries_when_database_changes(self, tmp_path: Path) -> None:
+        db = tmp_path / "status"
+        db.write_text("")
+        with (
+            patch("pyhomedot.resources.package._package_db", return_value=db),
+            patch("subprocess.run", return_value=MagicMock(returncode=0, stdout="ii  htop\n")) as mock_run,
+        ):
+            _installed_packages("apt", False)
+            _installed_cache.clear()
+            st = db.stat()
+            os.utime(db, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            mock_run.return_value = MagicMock(returncode=0, stdout="ii  htop\nii  jq\n")
+            assert _installed_packages("apt", False) == frozenset({"htop", "jq"})
+            assert mock_run.call_count == 2
+
+    def test_no_database_means_no_disk_cache(self, tmp_path: Path) -> None:
+        with (
+            patch("pyhomedot.resources.package._package_db", return_value=None),
+            patch("subprocess.run", return_value=MagicMock(returncode=0, stdout="htop\n")) as mock_run,
+        ):
+            _installed_packages("brew", False)
+            _installed_cache.clear()
+            _installed_packages("brew", False)
+            assert mock_run.call_count == 2
+        assert not (tmp_path / "cache" / "pyhomedot").exists()
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import os
+import stat
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from pyhomedot.resources import SymlinkResource
+from pyhomedot.resources.symlink import _DIR_FD_SUPPORTED, _files_equal, _parent_groups
 
 
 class TestSymlinkResource:
@@ -168,6 +172,24 @@ class TestSymlinkResource:
         assert target.is_symlink()
         assert target.resolve() == source_file.resolve()
 
+    def test_force_skips_content_comparison(self, tmp_path: Path) -> None:
+        """With force=True the existing file is replaced without reading it."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "hello.txt").write_text("hello")
+
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+        target = home_dir / "hello.txt"
+        target.write_text("existing content")
+
+        r = SymlinkResource("hello.txt", "hello.txt", source_root=source_dir, home_dir=home_dir, force=True)
+        with patch("pyhomedot.resources.symlink._contents_match") as mock_match:
+            r.generate()
+            mock_match.assert_not_called()
+
+        assert target.is_symlink()
+
     def test_force_replaces_directory(self, tmp_path: Path) -> None:
         """With force=True, removes existing directory and creates symlink."""
         source_dir = tmp_path / "project"
@@ -188,6 +210,105 @@ class TestSymlinkResource:
         target = home_dir / ".config" / "git"
         assert target.is_symlink()
 
+    def test_force_relink_swaps_atomically(self, tmp_path: Path) -> None:
+        """A symlink or file target is replaced by renaming a new link over it, never unlinked first."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "rc").write_text("rc")
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+        (home_dir / "rc").symlink_to(tmp_path / "elsewhere")
+
+        r = SymlinkResource("rc", "rc", force=True, source_root=source_dir, home_dir=home_dir)
+        with patch("os.unlink", wraps=os.unlink) as mock_unlink, patch("os.replace", wraps=os.replace) as mock_replace:
+            r.generate()
+            mock_unlink.assert_not_called()
+            mock_replace.assert_called_once()
+
+        assert (home_dir / "rc").resolve() == (source_dir / "rc").resolve()
+        assert sorted(p.name for p in home_dir.iterdir()) == ["rc"]
+
+    def test_source_symlink_loop_is_missing(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """A source that is a symlink loop is reported as missing, like a nonexistent one."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "loop").symlink_to(source_dir / "loop")
+
+        r = SymlinkResource("loop/x", "x", source_root=source_dir, home_dir=tmp_path / "home")
+        r.generate(dry_run=True)
+        assert "MISSING" in capsys.readouterr().out
+        with pytest.raises(FileNotFoundError):
+            r.generate()
+
+    def test_source_reassigned_to_relative_uses_construction_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The working directory is captured up front even when the source starts out absolute."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "f").write_text("f")
+        home_dir = tmp_path / "home"
+
+        monkeypatch.chdir(source_dir)
+        r = SymlinkResource(str(source_dir / "missing"), "f", home_dir=home_dir)
+        monkeypatch.chdir(tmp_path)
+        r.source = "f"
+        r.generate()
+
+        assert (home_dir / "f").resolve() == (source_dir / "f").resolve()
+
+    def test_target_appearing_after_inspection_is_rechecked(self, tmp_path: Path) -> None:
+        """If the target shows up between the check and creating the link, it gets the normal collision handling."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "rc").write_text("mine")
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+        (home_dir / "rc").write_text("theirs")
+
+        r = SymlinkResource("rc", "rc", source_root=source_dir, home_dir=home_dir)
+        with patch("pyhomedot.resources.symlink._lstat_mode", side_effect=[None, stat.S_IFREG]):
+            r.generate()
+
+        assert not (home_dir / "rc").is_symlink()
+        assert (home_dir / "rc").read_text() == "theirs"
+
+    def test_defaults_are_read_when_each_resource_is_created(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The working and home directories are looked up per resource, not once per process."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "x").write_text(name)
+
+        monkeypatch.chdir(tmp_path / "a")
+        monkeypatch.setenv("HOME", str(tmp_path / "home_a"))
+        first = SymlinkResource("x", "x")
+        monkeypatch.chdir(tmp_path / "b")
+        monkeypatch.setenv("HOME", str(tmp_path / "home_b"))
+        second = SymlinkResource("x", "x")
+
+        first.generate()
+        second.generate()
+        assert (tmp_path / "home_a" / "x").read_text() == "a"
+        assert (tmp_path / "home_b" / "x").read_text() == "b"
+
+    def test_reassigned_source_and_target_are_used(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Assigning to source or target after construction changes what is linked."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "a").write_text("a")
+        (source_dir / "b").write_text("b")
+        home_dir = tmp_path / "home"
+
+        r = SymlinkResource("a", "x", source_root=source_dir, home_dir=home_dir)
+        r.source = "b"
+        r.target = "y"
+        r.generate(dry_run=True)
+        assert "~/y" in capsys.readouterr().out
+        r.generate()
+
+        assert not (home_dir / "x").exists()
+        assert (home_dir / "y").read_text() == "b"
+
     def test_source_not_found_raises(self, tmp_path: Path) -> None:
         """Raises FileNotFoundError if source does not exist."""
         source_dir = tmp_path / "project"
@@ -218,3 +339,350 @@ class TestSymlinkResource:
 
         captured = capsys.readouterr()
         assert "symlink" in captured.out.lower() or "hello.txt" in captured.out
+
+    def test_dry_run_diff_shows_changed_lines(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "rc").write_text("keep\nnew\n")
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+        (home_dir / "rc").write_text("keep\nold\n")
+
+        r = SymlinkResource("rc", "rc", source_root=source_dir, home_dir=home_dir)
+        r.generate(dry_run=True, show_diff=True)
+
+        out = capsys.readouterr().out
+        assert "CONFLICT" in out
+        assert "    -old\n    +new\n" in out
+        assert not (home_dir / "rc").is_symlink()
+
+    def test_identical_binary_file_is_replaced(self, tmp_path: Path) -> None:
+        """An existing byte-identical binary file is replaced without force."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        source_file = source_dir / "pubring.kbx"
+        source_file.write_bytes(b"\x00\xff\xfe binary \x80")
+
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+
+        target = home_dir / "pubring.kbx"
+        target.write_bytes(b"\x00\xff\xfe binary \x80")
+
+        r = SymlinkResource("pubring.kbx", "pubring.kbx", source_root=source_dir, home_dir=home_dir)
+        r.generate()
+
+        assert target.is_symlink()
+        assert target.resolve() == source_file.resolve()
+
+    def test_directory_with_type_mismatch_is_a_conflict(self, tmp_path: Path) -> None:
+        """A file in the source and a directory of the same name in the target are not identical."""
+        source_dir = tmp_path / "project"
+        (source_dir / "nvim").mkdir(parents=True)
+        (source_dir / "nvim" / "lua").write_text("")
+
+        home_dir = tmp_path / "home"
+        target_dir = home_dir / ".config" / "nvim"
+        (target_dir / "lua").mkdir(parents=True)
+        (target_dir / "lua" / "init.lua").write_text("keep me")
+
+        r = SymlinkResource("nvim/", ".config/nvim/", source_root=source_dir, home_dir=home_dir)
+        r.generate()
+
+        assert not target_dir.is_symlink()
+        assert (target_dir / "lua" / "init.lua").read_text() == "keep me"
+
+    def test_skip_if_relative_symlink_points_to_source(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """A relative symlink is resolved against its own directory, not the working directory."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "hello.txt").write_text("hello")
+
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+
+        target = home_dir / "hello.txt"
+        target.symlink_to(os.path.join("..", "project", "hello.txt"))
+
+        r = SymlinkResource("hello.txt", "hello.txt", source_root=source_dir, home_dir=home_dir)
+        with patch("pyhomedot.resources.symlink._same_file") as mock_same_file:
+            r.generate()
+            # Settled by normalizing the link text, without stat calls
+            mock_same_file.assert_not_called()
+
+        assert "warning" not in capsys.readouterr().out.lower()
+        assert os.readlink(target) == os.path.join("..", "project", "hello.txt")
+
+    def test_skip_if_symlink_reaches_source_through_alias(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """A symlink that reaches the source through another symlinked path is already correct."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "hello.txt").write_text("hello")
+        alias = tmp_path / "dotfiles"
+        alias.symlink_to(source_dir)
+
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+
+        target = home_dir / "hello.txt"
+        target.symlink_to(alias / "hello.txt")
+
+        r = SymlinkResource("hello.txt", "hello.txt", source_root=source_dir, home_dir=home_dir)
+        r.generate()
+
+        assert "warning" not in capsys.readouterr().out.lower()
+        assert os.readlink(target) == str(alias / "hello.txt")
+
+    def test_identical_directory_tree_is_replaced(self, tmp_path: Path) -> None:
+        """A nested directory with the same content (ignoring .git) is replaced without force."""
+        source_dir = tmp_path / "project"
+        (source_dir / "nvim" / "lua").mkdir(parents=True)
+        (source_dir / "nvim" / "init.lua").write_text("init")
+        (source_dir / "nvim" / "lua" / "opts.lua").write_text("opts")
+
+        home_dir = tmp_path / "home"
+        target_dir = home_dir / ".config" / "nvim"
+        (target_dir / "lua").mkdir(parents=True)
+        (target_dir / ".git").mkdir()
+        (target_dir / "init.lua").write_text("init")
+        (target_dir / "lua" / "opts.lua").write_text("opts")
+
+        r = SymlinkResource("nvim/", ".config/nvim/", source_root=source_dir, home_dir=home_dir)
+        r.generate()
+
+        assert target_dir.is_symlink()
+
+    def test_nested_difference_is_a_conflict(self, tmp_path: Path) -> None:
+        """A difference deep inside a directory tree prevents replacing it."""
+        source_dir = tmp_path / "project"
+        (source_dir / "nvim" / "lua").mkdir(parents=True)
+        (source_dir / "nvim" / "lua" / "opts.lua").write_text("opts")
+
+        home_dir = tmp_path / "home"
+        target_dir = home_dir / ".config" / "nvim"
+        (target_dir / "lua").mkdir(parents=True)
+        (target_dir / "lua" / "opts.lua").write_text("local opts")
+
+        r = SymlinkResource("nvim/", ".config/nvim/", source_root=source_dir, home_dir=home_dir)
+        r.generate()
+
+        assert not target_dir.is_symlink()
+        assert (target_dir / "lua" / "opts.lua").read_text() == "local opts"
+
+    def test_nested_size_mismatch_reads_no_files(self, tmp_path: Path) -> None:
+        """A size difference deep in the tree is found before any file at the top is read."""
+        for root, deep in (("project", "x"), ("home", "xyz")):
+            app = tmp_path / root / "app"
+            (app / "sub").mkdir(parents=True)
+            (app / "top.txt").write_text("same")
+            (app / "sub" / "deep.txt").write_text(deep)
+
+        r = SymlinkResource("app", "app", source_root=tmp_path / "project", home_dir=tmp_path / "home")
+        with patch("builtins.open") as mock_open:
+            r.generate()
+            mock_open.assert_not_called()
+
+        assert not (tmp_path / "home" / "app").is_symlink()
+
+    def test_smallest_files_are_compared_first(self, tmp_path: Path) -> None:
+        """Content differences in small files are found without reading larger ones."""
+        big = os.urandom(256 * 1024)
+        for root, small in (("project", b"aaaa"), ("home", b"bbbb")):
+            app = tmp_path / root / "app"
+            app.mkdir(parents=True)
+            (app / "a_big.bin").write_bytes(big)
+            (app / "z_small.txt").write_bytes(small)
+
+        r = SymlinkResource("app", "app", source_root=tmp_path / "project", home_dir=tmp_path / "home")
+        with patch("builtins.open", wraps=open) as mock_open:
+            r.generate()
+
+        opened = {os.path.basename(c.args[0]) for c in mock_open.call_args_list}
+        assert opened == {"z_small.txt"}
+        assert not (tmp_path / "home" / "app").is_symlink()
+
+    def test_directory_size_mismatch_reads_no_files(self, tmp_path: Path) -> None:
+        """A file size difference anywhere in a directory is found before contents are read."""
+        source_dir = tmp_path / "project" / "app"
+        source_dir.mkdir(parents=True)
+        (source_dir / "a.txt").write_text("same")
+        (source_dir / "b.txt").write_text("short")
+        target_dir = tmp_path / "home" / "app"
+        target_dir.mkdir(parents=True)
+        (target_dir / "a.txt").write_text("same")
+        (target_dir / "b.txt").write_text("much longer")
+
+        r = SymlinkResource("app", "app", source_root=tmp_path / "project", home_dir=tmp_path / "home")
+        with patch("builtins.open") as mock_open:
+            r.generate()
+            mock_open.assert_not_called()
+
+        assert not target_dir.is_symlink()
+
+
+class TestFilesEqual:
+    """Test the byte-wise file comparison used for collision detection."""
+
+    def test_large_identical_files(self, tmp_path: Path) -> None:
+        data = os.urandom(300 * 1024)
+        (tmp_path / "a").write_bytes(data)
+        (tmp_path / "b").write_bytes(data)
+        assert _files_equal(tmp_path / "a", tmp_path / "b")
+
+    def test_difference_in_last_chunk(self, tmp_path: Path) -> None:
+        data = bytearray(os.urandom(300 * 1024))
+        (tmp_path / "a").write_bytes(data)
+        data[-1] ^= 0xFF
+        (tmp_path / "b").write_bytes(data)
+        assert not _files_equal(tmp_path / "a", tmp_path / "b")
+
+    def test_size_mismatch_does_not_read(self, tmp_path: Path) -> None:
+        (tmp_path / "a").write_bytes(b"abc")
+        (tmp_path / "b").write_bytes(b"abcd")
+        with patch("builtins.open") as mock_open:
+            assert not _files_equal(tmp_path / "a", tmp_path / "b")
+            mock_open.assert_not_called()
+
+    def test_empty_files(self, tmp_path: Path) -> None:
+        (tmp_path / "a").write_bytes(b"")
+        (tmp_path / "b").write_bytes(b"")
+        assert _files_equal(tmp_path / "a", tmp_path / "b")
+
+
+class TestSymlinkBatch:
+    """Test generating several symlinks from shared directory listings."""
+
+    def test_batch_lists_each_target_directory_once(self, tmp_path: Path) -> None:
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        home_dir = tmp_path / "home"
+        (home_dir / ".config").mkdir(parents=True)
+        for i in range(5):
+            (source_dir / f"f{i}").write_text(str(i))
+        (home_dir / ".config" / "f0").write_text("0")  # identical, replaced
+        (home_dir / ".config" / "f1").write_text("different")  # conflict, kept
+        (home_dir / ".config" / "f2").symlink_to(source_dir / "f2")  # already correct
+
+        resources = [
+            SymlinkResource(f"f{i}", f".config/f{i}", source_root=source_dir, home_dir=home_dir) for i in range(5)
+        ]
+        with patch("pyhomedot.resources.symlink._lstat_mode") as mock_lstat, patch(
+            "os.scandir", wraps=os.scandir
+        ) as mock_scandir:
+            SymlinkResource.generate_batch(resources)
+            mock_lstat.assert_not_called()
+            assert mock_scandir.call_count == 1
+
+        for i in (0, 2, 3, 4):
+            assert (home_dir / ".config" / f"f{i}").resolve() == (source_dir / f"f{i}").resolve()
+        assert not (home_dir / ".config" / "f1").is_symlink()
+
+    def test_batch_sees_its_own_changes(self, tmp_path: Path) -> None:
+        """A target repeated later in the batch sees the symlink created earlier."""
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "a").write_text("a")
+        home_dir = tmp_path / "home"
+
+        resources = [
+            SymlinkResource("a", "new/dir/a", source_root=source_dir, home_dir=home_dir),
+            SymlinkResource("a", "new/dir/a", source_root=source_dir, home_dir=home_dir),
+            SymlinkResource("a", "new/b", source_root=source_dir, home_dir=home_dir),
+        ]
+        SymlinkResource.generate_batch(resources)
+
+        assert (home_dir / "new" / "dir" / "a").is_symlink()
+        assert (home_dir / "new" / "b").is_symlink()
+
+    @pytest.mark.skipif(not _DIR_FD_SUPPORTED, reason="needs dir_fd support")
+    def test_batch_links_relative_to_open_directory(self, tmp_path: Path) -> None:
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        home_dir = tmp_path / "home"
+        home_dir.mkdir()
+        for name in ("a", "b"):
+            (source_dir / name).write_text(name)
+        (home_dir / "a").write_text("a")  # identical, replaced
+
+        resources = [SymlinkResource(n, n, source_root=source_dir, home_dir=home_dir) for n in ("a", "b")]
+        with patch("os.symlink", wraps=os.symlink) as mock_symlink, patch("os.close", wraps=os.close) as mock_close:
+            SymlinkResource.generate_batch(resources)
+
+        tmp_name, new_name = (c.args[1] for c in mock_symlink.call_args_list)
+        assert tmp_name.startswith(".a.pyhomedot-") and new_name == "b"
+        assert all(isinstance(c.kwargs["dir_fd"], int) for c in mock_symlink.call_args_list)
+        mock_close.assert_called_once()
+        assert (home_dir / "a").is_symlink() and (home_dir / "b").is_symlink()
+
+    def test_batch_over_many_directories_stays_within_descriptor_limit(self, tmp_path: Path) -> None:
+        """Open target directories are capped, so a serial batch doesn't run out of file descriptors."""
+        resource = pytest.importorskip("resource")
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        (source_dir / "f").write_text("f")
+        home_dir = tmp_path / "home"
+        for i in range(100):
+            (home_dir / f"d{i}").mkdir(parents=True)
+
+        # A target that contains another target's directory keeps the batch serial
+        resources = [SymlinkResource("f", f"d{i}/f", source_root=source_dir, home_dir=home_dir) for i in range(100)]
+        resources.append(SymlinkResource("f", "d0", source_root=source_dir, home_dir=home_dir))
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (len(os.listdir("/dev/fd")) + 30, hard))
+        try:
+            SymlinkResource.generate_batch(resources)
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+        assert all((home_dir / f"d{i}" / "f").is_symlink() for i in range(100))
+
+    def test_batch_creates_each_parent_once(self, tmp_path: Path) -> None:
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        home_dir = tmp_path / "home"
+        (home_dir / "existing").mkdir(parents=True)
+        for name in ("a", "b", "c"):
+            (source_dir / name).write_text(name)
+
+        resources = [
+            SymlinkResource(n, f"{parent}/{n}", source_root=source_dir, home_dir=home_dir)
+            for parent in ("existing", "new/dir")
+            for n in ("a", "b", "c")
+        ]
+        with patch("os.makedirs", wraps=os.makedirs) as mock_makedirs:
+            SymlinkResource.generate_batch(resources)
+
+        # os.makedirs recurses into itself for missing ancestors, so count only the outer calls
+        outer = [c.args[0] for c in mock_makedirs.call_args_list if c.args[0].endswith("dir")]
+        assert outer == [os.path.join(home_dir, "new", "dir")]
+        assert all((home_dir / "new" / "dir" / n).is_symlink() for n in ("a", "b", "c"))
+
+    def test_large_batch_runs_parent_directories_in_parallel(self, tmp_path: Path) -> None:
+        source_dir = tmp_path / "project"
+        source_dir.mkdir()
+        home_dir = tmp_path / "home"
+        names = [f"f{i}" for i in range(6)]
+        for name in names:
+            (source_dir / name).write_text(name)
+
+        resources = [
+            SymlinkResource(n, f"{parent}/{n}", source_root=source_dir, home_dir=home_dir)
+            for parent in ("one", "two")
+            for n in names
+        ]
+        with patch("concurrent.futures.ThreadPoolExecutor", wraps=concurrent.futures.ThreadPoolExecutor) as mock_pool:
+            SymlinkResource.generate_batch(resources)
+            mock_pool.assert_called_once_with(max_workers=2)
+
+        assert all((home_dir / parent / n).is_symlink() for parent in ("one", "two") for n in names)
+
+    def test_nested_targets_are_not_grouped(self, tmp_path: Path) -> None:
+        """A target that contains another target's parent keeps the batch in order."""
+        home_dir = tmp_path / "home"
+        outer = SymlinkResource("nvim", ".config/nvim", home_dir=home_dir)
+        inner = SymlinkResource("init.lua", ".config/nvim/init.lua", home_dir=home_dir)
+        other = SymlinkResource("zshrc", ".zshrc", home_dir=home_dir)
+
+        planned = [(r, r._resolve_target()) for r in (outer, inner, other)]
+        assert _parent_groups(planned) is None
+        assert _parent_groups([planned[0], planned[2]]) == [[planned[0]], [planned[2]]]